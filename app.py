@@ -9,9 +9,29 @@ This Streamlit application provides a user interface for:
 """
 
 import streamlit as st
-from src.python.ai import AutomataAnalyzer
+from src.python.ai import AutomataAnalyzer, preprocess_image
 import os
 
+# Largest upload accepted; bigger files are rejected before any decoding or API calls
+MAX_UPLOAD_BYTES = 8 * 1024 * 1024
+
+# Uploads of at least this many diagrams go through one Mistral batch job
+# instead of concurrent chat requests
+BATCH_MIN_FILES = 8
+
+@st.cache_resource
+def get_analyzer(api_key: str) -> AutomataAnalyzer:
+    """
+    Create the analyzer once per API key and share it across reruns and sessions.
+    
+    Args:
+        api_key (str): Mistral API key
+        
+    Returns:
+        AutomataAnalyzer: Analyzer whose client keeps its connection pool alive
+    """
+    return AutomataAnalyzer(api_key)
+
 def main():
     """
     Main function to run the Streamlit application.
@@ -30,19 +50,48 @@ def main():
     if 'current_step' not in st.session_state:
         st.session_state.update({
             'current_step': 0,
-            'uploaded_file': None,
-            'analysis_result': None,
-            'edited_result': None
+            'uploaded_files': [],
+            'selected_diagram': 0,
+            'analysis_results': None,
+            'edited_results': None
         })
 
+    uploaded_files = st.session_state.uploaded_files
+    selected = st.session_state.selected_diagram
+
     # Step 0: File Upload
     if st.session_state.current_step == 0:
         st.subheader("Step 1: Upload State Diagram")
-        uploaded_file = st.file_uploader("Choose an image file", type=["jpg", "jpeg", "png"])
+        uploaded_files = st.file_uploader(
+            "Choose image files",
+            type=["jpg", "jpeg", "png"],
+            accept_multiple_files=True,
+            help=f"Uploading {BATCH_MIN_FILES} or more diagrams submits them as one "
+                 "Mistral batch job, which costs less but can take several minutes."
+        )
+        
+        oversized = [f for f in uploaded_files if f.size > MAX_UPLOAD_BYTES]
+        if oversized:
+            st.error(
+                f"Skipping files larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB: "
+                + ", ".join(f.name for f in oversized)
+            )
+            uploaded_files = [f for f in uploaded_files if f.size <= MAX_UPLOAD_BYTES]
         
-        if uploaded_file:
-            st.session_state.uploaded_file = uploaded_file
-            st.image(uploaded_file, caption="Uploaded Diagram", use_container_width=True)
+        if uploaded_files:
+            # Results belong to the previous upload, so analyze this one afresh
+            st.session_state.update({
+                'uploaded_files': uploaded_files,
+                'selected_diagram': 0,
+                'analysis_results': None,
+                'edited_results': None
+            })
+            # Display the cached, downscaled copy rather than the raw upload
+            st.image(
+                [preprocess_image(f.getvalue()) for f in uploaded_files],
+                caption=[f.name for f in uploaded_files],
+                use_container_width=True
+            )
             
             col1, col2 = st.columns([3, 1])
             with col2:
@@ -55,33 +104,52 @@ def main():
         st.subheader("Step 2: Analysis Results")
         
         
-        if st.session_state.uploaded_file:
-            st.image(st.session_state.uploaded_file, caption="Your Diagram", use_container_width=True)
+        if uploaded_files:
+            # Pick which diagram to review and convert when several were uploaded
+            if len(uploaded_files) > 1:
+                selected = st.selectbox(
+                    "Diagram",
+                    range(len(uploaded_files)),
+                    index=selected,
+                    format_func=lambda i: uploaded_files[i].name
+                )
+                st.session_state.selected_diagram = selected
+            
+            st.image(
+                preprocess_image(uploaded_files[selected].getvalue()),
+                caption="Your Diagram",
+                use_container_width=True
+            )
             
             api_key = st.secrets.get("MISTRAL_API_KEY")
             if not api_key:
                 st.error("Missing Mistral API key!")
                 return
                 
-            if not st.session_state.analysis_result:
-                analyzer = AutomataAnalyzer(api_key)
+            if not st.session_state.analysis_results:
+                analyzer = get_analyzer(api_key)
                 
                 with st.status("Analyzing automata...", expanded=True) as status:
                     try:
-                        st.write("Encoding image...")
-                        base64_image = analyzer.encode_image(st.session_state.uploaded_file)
-                        
-                        st.write("Processing with AI...")
-                        st.session_state.analysis_result = analyzer.analyze(base64_image)
-                        st.session_state.edited_result = st.session_state.analysis_result
+                        if len(uploaded_files) >= BATCH_MIN_FILES:
+                            st.write(f"Submitting {len(uploaded_files)} diagrams as one Mistral "
+                                     "batch job; this can take several minutes...")
+                            results = analyzer.analyze_batch(
+                                [analyzer.encode_image(f) for f in uploaded_files]
+                            )
+                        else:
+                            st.write("Encoding images and processing with AI...")
+                            results = analyzer.analyze_many(uploaded_files)
+                        st.session_state.analysis_results = results
+                        st.session_state.edited_results = list(results)
                         
                         status.update(label="Analysis complete!", state="complete")
                     except Exception as e:
                         st.error(f"Analysis failed: {str(e)}")
                         status.update(state="error")
-                        st.session_state.analysis_result = None
+                        st.session_state.analysis_results = None
             
-            if st.session_state.analysis_result:
+            if st.session_state.analysis_results:
                 st.subheader("Automata Analysis Results")
                 st.warning("⚠️ AI analysis may contain errors. Please review and correct the results before proceeding.")
                 
@@ -89,15 +157,15 @@ def main():
                 with st.container(border=True):
                     edited = st.text_area(
                         "Edit Analysis Results", 
-                        value=st.session_state.edited_result,
+                        value=st.session_state.edited_results[selected],
                         height=400,
-                        key="results_editor",
+                        key=f"results_editor_{selected}",
                         label_visibility="collapsed"
                     )
                     
                     # Save button with visual feedback
                     if st.button("💾 Save Edits", use_container_width=True):
-                        st.session_state.edited_result = edited
+                        st.session_state.edited_results[selected] = edited
                         st.toast("Edits saved successfully!", icon="✅")
 
         # Navigation controls
@@ -105,31 +173,34 @@ def main():
         with col1:
             if st.button("← Previous", use_container_width=True):
                 st.session_state.current_step = 0
-                st.session_state.analysis_result = None
-                st.session_state.edited_result = None
+                st.session_state.analysis_results = None
+                st.session_state.edited_results = None
                 st.rerun()
         with col2:
             if st.button("Next →", 
                        use_container_width=True,
-                       disabled=not st.session_state.edited_result):
+                       disabled=not (st.session_state.edited_results
+                                     and st.session_state.edited_results[selected])):
                 st.session_state.current_step = 2
                 st.rerun()
 
     # Step 2: Conversion and Visualization
     elif st.session_state.current_step == 2:
         st.subheader("Step 3: NFA to DFA Conversion")
+        uploaded_file = uploaded_files[selected] if uploaded_files else None
+        edited_result = st.session_state.edited_results[selected]
         
         # Show NFA description
-        if st.session_state.edited_result:
+        if edited_result:
             st.subheader("NFA Description")
-            st.code(st.session_state.edited_result)
+            st.code(edited_result)
         
         if st.button("Convert to DFA", use_container_width=True):
             try:
                 with st.status("Converting NFA to DFA...") as status:
                     # Run conversion pipeline
                     from src.python.converter import convert_to_dfa
-                    conversion_log, png_data = convert_to_dfa(st.session_state.edited_result)
+                    conversion_log, png_data = convert_to_dfa(edited_result)
                     
                     # Display conversion log
                     st.subheader("Conversion Log")
@@ -139,8 +210,12 @@ def main():
                 with col1:
                     # Show the original NFA diagram
                     st.subheader("Original NFA")
-                    if st.session_state.uploaded_file:
-                        st.image(st.session_state.uploaded_file, caption="Original State Diagram", use_container_width=True)
+                    if uploaded_file:
+                        st.image(
+                            preprocess_image(uploaded_file.getvalue()),
+                            caption="Original State Diagram",
+                            use_container_width=True
+                        )
                 with col2:
                     # Show DFA visualization if available
                     if png_data is not None:
@@ -150,10 +225,10 @@ def main():
                 # Add download buttons for both diagrams
                 col1, col2 = st.columns(2)
                 with col1:
-                    if st.session_state.uploaded_file:
+                    if uploaded_file:
                         st.download_button(
                             "Download NFA Diagram",
-                            st.session_state.uploaded_file,
+                            uploaded_file,
                             file_name="nfa_diagram.png",
                             mime="image/png"
                         )
@@ -179,6 +254,9 @@ def main():
         with col2:
             if st.button("Start again ↻", type="primary", use_container_width=True):
                 st.session_state.current_step = 0
+                st.session_state.selected_diagram = 0
+                st.session_state.analysis_results = None
+                st.session_state.edited_results = None
                 st.rerun()
 
 if __name__ == "__main__":
@@ -0,0 +1,21 @@
+"""
+Build script for the nfa2dfa_ext C++ extension.
+
+Usage:
+    python setup.py build_ext --inplace
+"""
+
+from pybind11.setup_helpers import Pybind11Extension, build_ext
+from setuptools import setup
+
+setup(
+    name="nfa2dfa_ext",
+    ext_modules=[
+        Pybind11Extension(
+            "nfa2dfa_ext",
+            ["src/cpp/bindings.cpp"],
+            cxx_std=17,
+        )
+    ],
+    cmdclass={"build_ext": build_ext},
+)
@@ -0,0 +1,77 @@
+/**
+ * @file bindings.cpp
+ * @brief pybind11 bindings exposing the NFA to DFA conversion to Python
+ *
+ * Builds the nfa2dfa_ext module, which runs the subset construction from
+ * converter.cpp in-process and returns the conversion log and the DOT
+ * description as strings instead of going through stdin and stdout.
+ *
+ * Build with: python setup.py build_ext --inplace
+ */
+
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include <stdexcept>
+#include <tuple>
+#include <vector>
+
+#define NFA2DFA_NO_MAIN
+#include "converter.cpp"
+
+namespace py = pybind11;
+
+using Transition = std::tuple<std::string, std::string, std::string>;
+
+/**
+ * @brief Validates that a symbol is a single ASCII character
+ * @param symbol Symbol received from Python (UTF-8 encoded)
+ * @return The symbol character
+ * @throws std::invalid_argument (ValueError in Python) for any other symbol
+ */
+char toSymbol(const std::string &symbol) {
+    if (symbol.size() != 1 || static_cast<unsigned char>(symbol[0]) > 0x7F) {
+        throw std::invalid_argument("Invalid symbol '" + symbol + "': symbols must be single ASCII characters");
+    }
+    return symbol[0];
+}
+
+/**
+ * @brief Converts an NFA to a DFA
+ * @param states All states of the NFA
+ * @param symbols Input symbols, each a single ASCII character
+ * @param start The start state
+ * @param accepting The accepting states
+ * @param transitions Transitions as (fromState, symbol, toState) tuples
+ * @return Pair of (conversion log, DOT description of the DFA)
+ */
+std::pair<std::string, std::string> convert(const std::vector<std::string> &states,
+                                            const std::vector<std::string> &symbols,
+                                            const std::string &start,
+                                            const std::vector<std::string> &accepting,
+                                            const std::vector<Transition> &transitions) {
+    NFA nfa;
+    nfa.states.insert(states.begin(), states.end());
+    for (const auto &symbol : symbols) {
+        nfa.symbols.insert(toSymbol(symbol));
+    }
+    nfa.startState = start;
+    nfa.acceptingStates.insert(accepting.begin(), accepting.end());
+    for (const auto &transition : transitions) {
+        nfa.addTransition(std::get<0>(transition), toSymbol(std::get<1>(transition)), std::get<2>(transition));
+    }
+
+    std::ostringstream log, dot;
+    nfa.displayNFA(log);
+    displayConversion(nfa, log, dot);
+    return {log.str(), dot.str()};
+}
+
+PYBIND11_MODULE(nfa2dfa_ext, m) {
+    m.doc() = "In-process NFA to DFA conversion using subset construction";
+    m.def("convert", &convert,
+          py::arg("states"), py::arg("symbols"), py::arg("start"),
+          py::arg("accepting"), py::arg("transitions"),
+          py::call_guard<py::gil_scoped_release>(),
+          "Convert an NFA to a DFA and return (log, dot)");
+}
@@ -6,13 +6,14 @@
  * - Input an NFA from user
  * - Display the NFA
  * - Convert the NFA to a DFA using the subset construction algorithm
- * - Display and visualize the resulting DFA
+ * - Display the resulting DFA and describe it in DOT format for visualization
  */
 
 #include <iostream>
+#include <ostream>
 #include <set>
 #include <string>
-#include <fstream>
+#include <sstream>
 #include <queue>
 #include <stack>
 #include <map>
@@ -41,39 +42,40 @@ public:
 
     /**
      * @brief Displays the NFA details
+     * @param out Stream the details are written to
      */
-    void displayNFA(){
+    void displayNFA(std::ostream &out = std::cout){
 
-        std::cout<<"********************************************"<<std::endl;
-        std::cout << "States: ";
-        for (const auto &states : states)std::cout << states << " ";
-        std::cout << "\n";
+        out<<"********************************************"<<std::endl;
+        out << "States: ";
+        for (const auto &states : states)out << states << " ";
+        out << "\n";
 
-        std::cout << "\nSymbols: ";
-        for (const auto &symbol : symbols)std::cout << symbol << " ";
-        std::cout << "\n";
+        out << "\nSymbols: ";
+        for (const auto &symbol : symbols)out << symbol << " ";
+        out << "\n";
 
-        std::cout << "\nstart state: ";
-        std::cout << startState << " ";
-        std::cout << "\n";
+        out << "\nstart state: ";
+        out << startState << " ";
+        out << "\n";
 
-        std::cout << "\nTransition:\n";
+        out << "\nTransition:\n";
         for (const auto &state : transactionState){
             for (const auto &symbol : state.second){
-                std::cout << "From state " << state.first << " -> " << symbol.first << " -> ";
+                out << "From state " << state.first << " -> " << symbol.first << " -> ";
                 for (const auto &toState : symbol.second){
-                    std::cout << toState << " ";
+                    out << toState << " ";
                 }
-                std::cout << "\n";
+                out << "\n";
             }
         }
-        std::cout << "\n";
+        out << "\n";
 
-        std::cout << "acceptance state: ";
-        for (const auto &accstate : acceptingStates)std::cout << accstate << " ";
-        std::cout << "\n";
+        out << "acceptance state: ";
+        for (const auto &accstate : acceptingStates)out << accstate << " ";
+        out << "\n";
 
-        std::cout<<"********************************************"<<std::endl;
+        out<<"********************************************"<<std::endl;
     }
 
     /**
@@ -123,6 +125,7 @@ public:
         while (!unprocessedStates.empty()) {
             std::set<std::string> currentState = unprocessedStates.front();
             unprocessedStates.pop();
+            dfa[currentState];  // Record every reached state, including sinks
 
             for (const char &symbol : symbols) {
                 std::set<std::string> nextStates;
@@ -205,15 +208,15 @@ void inputNFA(NFA &nfa) {
 }
 
 /**
- * @brief Displays the conversion result and generates a DOT file for visualization
+ * @brief Displays the conversion result and generates a DOT description for visualization
  * @param nfa Reference to the NFA object
+ * @param out Stream the conversion log is written to
+ * @param dotFile Stream the DOT description is written to
  */
-void displayConversion(NFA &nfa) {
+void displayConversion(NFA &nfa, std::ostream &out, std::ostream &dotFile) {
     std::map<std::set<std::string>, std::map<char, std::set<std::string>>> dfa = nfa.convertToDFA();
-    std::cout << "\nConverted DFA:\n";
+    out << "\nConverted DFA:\n";
     
-    // Output to a .dot file for visualization
-    std::ofstream dotFile("dfa.dot");
     dotFile << "digraph DFA {\n";
     dotFile << "    rankdir=LR;\n";  // Left to right layout
     
@@ -281,21 +284,21 @@ void displayConversion(NFA &nfa) {
     }
 
     dotFile << "}\n";
-    dotFile.close();
 
     // Display DFA in console
     for (const auto &state : dfa) {
-        std::cout << "State " << stateNames[state.first] << " { ";
-        for (const auto &st : state.first) std::cout << st << " ";
-        std::cout << "}:\n";
+        out << "State " << stateNames[state.first] << " { ";
+        for (const auto &st : state.first) out << st << " ";
+        out << "}:\n";
         for (const auto &symbol : state.second) {
-            std::cout << "    On symbol '" << symbol.first << "' -> { ";
-            for (const auto &toState : symbol.second) std::cout << toState << " ";
-            std::cout << "}\n";
+            out << "    On symbol '" << symbol.first << "' -> { ";
+            for (const auto &toState : symbol.second) out << toState << " ";
+            out << "}\n";
         }
     }
 }
 
+#ifndef NFA2DFA_NO_MAIN
 /**
  * @brief Main function to run the NFA to DFA converter
  * @return Exit status
@@ -304,7 +307,12 @@ int main(){
     NFA nfa;
     inputNFA(nfa);
     nfa.displayNFA();
-    displayConversion(nfa);
+
+    // Write the DOT description to stdout after the conversion log
+    std::ostringstream dotFile;
+    displayConversion(nfa, std::cout, dotFile);
+    std::cout << dotFile.str();
 
     return 0;
-}
\ No newline at end of file
+}
+#endif
\ No newline at end of file
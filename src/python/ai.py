@@ -3,12 +3,156 @@ AI-powered automata analyzer module.
 
 This module provides functionality to analyze images of automata diagrams
 using Mistral AI's vision capabilities to extract states, symbols, and transitions.
+
+Image budget: every upload is downscaled so its longest edge is at most
+MAX_IMAGE_EDGE (1536px) and sent with IMAGE_DETAIL ("low"), which is enough
+to read a state diagram while keeping image tokens and latency down. The
+smallest of the original file, a JPEG at JPEG_QUALITY (85) and a PNG is
+sent, so small line drawings are not bloated by JPEG re-encoding.
 """
 
-import base64
+import httpx
+import io
+import json
+import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import streamlit as st
 from mistralai import Mistral
+from PIL import Image, ImageOps
 import os
 
+try:
+    # SIMD accelerated drop-in replacement for the standard library encoder
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+MODEL = "pixtral-12b-2409"
+
+# Seconds between status checks of a running batch job
+BATCH_POLL_INTERVAL = 2
+
+# Seconds to wait for a batch job before cancelling it
+BATCH_TIMEOUT = 30 * 60
+
+# Worker threads used to encode and analyze several images concurrently
+MAX_WORKERS = 4
+
+# Idle connections kept open to the Mistral API, one per possible worker
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=MAX_WORKERS, keepalive_expiry=60)
+
+# Longest edge (in pixels) and JPEG quality of the image sent to the model
+MAX_IMAGE_EDGE = 1536
+JPEG_QUALITY = 85
+
+# Vision detail level requested for each image
+IMAGE_DETAIL = "low"
+
+# Distinct uploads kept by each memoized image helper across reruns
+CACHE_MAX_ENTRIES = 32
+
+# Formats that may be sent to the model without re-encoding
+_PASSTHROUGH_FORMATS = ("JPEG", "PNG")
+
+# Dedented once at import so prompts carry no source indentation
+_SYSTEM_INSTRUCTIONS = textwrap.dedent("""
+    1)States: Identify all states and rename them sequentially as q0, q1, q2, ..., regardless of their original labels.
+    2)Input Symbols: Detect all distinct symbols used in transitions.
+    3)Start State: Identify the unique start state.
+    4)Accepting States: Identify all accepting states.
+    5)Transitions: Extract all valid transitions in the format: fromState symbol toState
+        Ensure every transition present in the NFA is captured.
+        No transitions should be missing, duplicated, or altered.
+
+    Your response must strictly follow this structure without additional explanations, symbols, or formatting artifacts (e.g., quotes, extra spaces, or newlines):
+    Enter number of states: <num_states>
+    Enter states: <list_of_states>
+    Enter number of symbols: <num_symbols>
+    Enter symbols (separate by space): <symbols>
+    Enter start state: <start_state>
+    Enter number of accepting states: <num_accepting_states>
+    Enter accepting states: <accepting_states>
+    Enter number of transitions: <num_transitions>
+    Enter transition (fromState symbol toState): <fromState> <symbol> <toState>
+
+    The number of states, symbols, and transitions must be correctly counted.
+    The output must not contain any extra text, explanations, or formatting beyond what is specified.
+""").strip()
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def preprocess_image(file_bytes: bytes) -> bytes:
+    """
+    Downscale and recompress an uploaded image before it is sent to the model.
+    
+    The original bytes are kept when the image is an upright, opaque JPEG or
+    PNG that needs no downscaling and no re-encoding is smaller. Otherwise
+    the smaller of a JPEG and a PNG encoding of the processed image is used.
+    
+    Args:
+        file_bytes (bytes): Raw bytes of the uploaded image
+        
+    Returns:
+        bytes: JPEG or PNG encoded image whose longest edge is at most MAX_IMAGE_EDGE
+    """
+    img = Image.open(io.BytesIO(file_bytes))
+    orientation = img.getexif().get(0x0112, 1)
+    keep_original = (
+        img.format in _PASSTHROUGH_FORMATS
+        and img.mode in ("L", "RGB")
+        and orientation == 1
+        and max(img.size) <= MAX_IMAGE_EDGE
+    )
+    
+    # Let the JPEG decoder scale down while decoding, so large photos are
+    # never held in memory at full resolution (no-op for other formats)
+    img.draft("RGB", (MAX_IMAGE_EDGE, MAX_IMAGE_EDGE))
+    img = ImageOps.exif_transpose(img)
+    img.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.LANCZOS)
+    
+    # Flatten transparent backgrounds onto white so dark strokes stay visible
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGBA", img.size, "white")
+        img = Image.alpha_composite(background, img)
+    if img.mode not in ("L", "RGB"):
+        img = img.convert("RGB")
+    
+    candidates = [file_bytes] if keep_original else []
+    for image_format, options in (("JPEG", {"quality": JPEG_QUALITY}), ("PNG", {})):
+        buf = io.BytesIO()
+        img.save(buf, image_format, optimize=True, **options)
+        candidates.append(buf.getvalue())
+    return min(candidates, key=len)
+
+def image_mime_type(image_data: str) -> str:
+    """
+    Detect the MIME type of a base64 encoded image from its signature.
+    
+    Args:
+        image_data (str): Base64 encoded image data
+        
+    Returns:
+        str: "image/png" for PNG data, otherwise "image/jpeg"
+    """
+    header = base64.b64decode(image_data[:8])
+    if header.startswith(b"\x89PNG"):
+        return "image/png"
+    return "image/jpeg"
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def encode_image_cached(file_bytes: bytes) -> str:
+    """
+    Encode raw image bytes to base64, memoized across Streamlit reruns.
+    
+    Args:
+        file_bytes (bytes): Raw bytes of the uploaded image
+        
+    Returns:
+        str: Base64 encoded image string
+    """
+    return base64.b64encode(file_bytes).decode('ascii')
+
 class AutomataAnalyzer:
     """
     A class for analyzing automata diagrams using AI vision models.
@@ -26,46 +170,27 @@ class AutomataAnalyzer:
                                      attempts to get from environment.
         """
         self.api_key = api_key or os.environ.get("MISTRAL_API_KEY")
-        self.client = Mistral(api_key=self.api_key) if self.api_key else None
-        self.system_instructions = """
-        1)States: Identify all states and rename them sequentially as q0, q1, q2, ..., regardless of their original labels.
-        2)Input Symbols: Detect all distinct symbols used in transitions.
-        3)Start State: Identify the unique start state.
-        4)Accepting States: Identify all accepting states.
-        5)Transitions: Extract all valid transitions in the format: fromState symbol toState
-            Ensure every transition present in the NFA is captured.
-            No transitions should be missing, duplicated, or altered.
-            
-        Your response must strictly follow this structure without additional explanations, symbols, or formatting artifacts (e.g., quotes, extra spaces, or newlines):
-        Enter number of states: <num_states>  
-        Enter states: <list_of_states>  
-        Enter number of symbols: <num_symbols>  
-        Enter symbols (separate by space): <symbols>  
-        Enter start state: <start_state>  
-        Enter number of accepting states: <num_accepting_states>  
-        Enter accepting states: <accepting_states>  
-        Enter number of transitions: <num_transitions>  
-        Enter transition (fromState symbol toState): <fromState> <symbol> <toState>  
-
-        The number of states, symbols, and transitions must be correctly counted.
-        The output must not contain any extra text, explanations, or formatting beyond what is specified.
-        """
+        self.client = None
+        if self.api_key:
+            # HTTP/2 with keep-alive so repeated calls reuse one TLS session
+            http_client = httpx.Client(http2=True, limits=HTTP_LIMITS, follow_redirects=True)
+            self.client = Mistral(api_key=self.api_key, client=http_client)
 
     def encode_image(self, uploaded_file):
         """
-        Encode uploaded file to base64.
+        Downscale the uploaded file and encode it to base64.
         
         Args:
             uploaded_file: The uploaded file object from Streamlit
             
         Returns:
-            str: Base64 encoded image string
+            str: Base64 encoded JPEG or PNG image string
             
         Raises:
             ValueError: If image encoding fails
         """
         try:
-            return base64.b64encode(uploaded_file.getvalue()).decode('utf-8')
+            return encode_image_cached(preprocess_image(uploaded_file.getvalue()))
         except Exception as e:
             raise ValueError(f"Image encoding failed: {e}")
 
@@ -84,27 +209,168 @@ class AutomataAnalyzer:
         """
         if not self.client:
             raise ValueError("Mistral API client not initialized")
+        
+        response = self.client.chat.complete(
+            model=MODEL,
+            messages=self._build_messages(image_data)
+        )
+        raw_output = response.choices[0].message.content
+        return self.clean_output(raw_output)
+
+    def analyze_many(self, uploaded_files):
+        """
+        Encode and analyze several uploaded files concurrently.
+        
+        Each image is sent to Mistral as soon as it has been encoded, so
+        encoding later images overlaps with the requests already in flight.
+        
+        Args:
+            uploaded_files (list): Uploaded file objects from Streamlit
+            
+        Returns:
+            list[str]: Cleaned analysis results, in the order of the input
             
-        messages = [
+        If any image fails, images still queued are neither encoded nor
+        sent, and the first error is re-raised.
+        
+        Raises:
+            ValueError: If encoding any image fails or the client is not initialized
+            Exception: Errors raised by the Mistral SDK propagate unchanged
+        """
+        results = [None] * len(uploaded_files)
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            encodings = {
+                executor.submit(self.encode_image, uploaded_file): i
+                for i, uploaded_file in enumerate(uploaded_files)
+            }
+            analyses = {}
+            try:
+                for future in as_completed(encodings):
+                    analyses[executor.submit(self.analyze, future.result())] = encodings[future]
+                
+                for future in as_completed(analyses):
+                    results[analyses[future]] = future.result()
+            except BaseException:
+                # Drop queued work so the executor does not wait for it on exit
+                for future in list(encodings) + list(analyses):
+                    future.cancel()
+                raise
+        
+        return results
+
+    def analyze_batch(self, image_data_list, timeout=BATCH_TIMEOUT):
+        """
+        Analyze several images with a single Mistral batch job.
+        
+        The requests are uploaded as one JSONL file and the job is polled
+        until it finishes, so this trades latency for fewer round trips.
+        
+        Args:
+            image_data_list (list[str]): Base64 encoded image data
+            timeout (float): Seconds to wait for the job before cancelling it
+            
+        Returns:
+            list[str]: Cleaned analysis results, in the order of the input
+            
+        Raises:
+            ValueError: If Mistral client is not initialized, the job fails
+                        or times out, or any image has no usable result
+        """
+        if not self.client:
+            raise ValueError("Mistral API client not initialized")
+        
+        batch_input = "\n".join(
+            json.dumps({"custom_id": str(i), "body": {"messages": self._build_messages(image_data)}})
+            for i, image_data in enumerate(image_data_list)
+        )
+        batch_file = self.client.files.upload(
+            file={"file_name": "automata_batch.jsonl", "content": batch_input.encode("utf-8")},
+            purpose="batch"
+        )
+        job = self.client.batch.jobs.create(
+            input_files=[batch_file.id],
+            model=MODEL,
+            endpoint="/v1/chat/completions"
+        )
+        
+        deadline = time.monotonic() + timeout
+        while job.status in ("QUEUED", "RUNNING"):
+            if time.monotonic() >= deadline:
+                self.client.batch.jobs.cancel(job_id=job.id)
+                raise ValueError(f"Batch job {job.id} did not finish within {timeout} seconds")
+            time.sleep(BATCH_POLL_INTERVAL)
+            job = self.client.batch.jobs.get(job_id=job.id)
+        
+        if job.status != "SUCCESS" or not job.output_file:
+            raise ValueError(f"Batch job {job.id} ended with status {job.status}")
+        
+        raw_outputs = {}
+        output = self.client.files.download(file_id=job.output_file)
+        for line in output.read().decode("utf-8").splitlines():
+            if line.strip():
+                record = json.loads(line)
+                raw_outputs[record["custom_id"]] = self._batch_output_content(record)
+        
+        missing = [str(i) for i in range(len(image_data_list)) if str(i) not in raw_outputs]
+        if missing:
+            raise ValueError(f"Batch job {job.id} returned no result for images {', '.join(missing)}")
+        
+        return [self.clean_output(raw_outputs[str(i)]) for i in range(len(image_data_list))]
+
+    def _batch_output_content(self, record):
+        """
+        Extract the completion text from one batch output record.
+        
+        Args:
+            record (dict): Parsed line of the batch job output file
+            
+        Returns:
+            str: Raw message content of the completion
+            
+        Raises:
+            ValueError: If the request failed or the record has no completion
+        """
+        custom_id = record.get("custom_id")
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code", 200) != 200:
+            error = record.get("error") or response.get("body")
+            raise ValueError(f"Batch request for image {custom_id} failed: {error}")
+        
+        try:
+            return response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            raise ValueError(f"Batch request for image {custom_id} returned no completion")
+
+    def _build_messages(self, image_data):
+        """
+        Build the chat messages for analyzing one image.
+        
+        Args:
+            image_data (str): Base64 encoded image data
+            
+        Returns:
+            list: Messages for the chat completion endpoint
+        """
+        return [
             {
                 "role": "system",
-                "content": self.system_instructions
+                "content": _SYSTEM_INSTRUCTIONS
             },
             {
                 "role": "user",
                 "content": [
                     {"type": "text", "text": "Analyze the image"},
-                    {"type": "image_url", "image_url": f"data:image/jpeg;base64,{image_data}"}
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{image_mime_type(image_data)};base64,{image_data}",
+                            "detail": IMAGE_DETAIL
+                        }
+                    }
                 ]
             }
         ]
-        
-        response = self.client.chat.complete(
-            model="pixtral-12b-2409",
-            messages=messages
-        )
-        raw_output = response.choices[0].message.content
-        return self.clean_output(raw_output)
 
     def clean_output(self, raw_text):
         """
@@ -2,152 +2,140 @@
 NFA to DFA converter module.
 
 This module provides functionality to convert an NFA description to a DFA
-by interfacing with the C++ implementation and handling the conversion process.
+by interfacing with the C++ extension, or its pure-Python equivalent when
+the extension has not been built, and handling the conversion process.
 """
 
-import os
-import subprocess
-import tempfile
+import re
+from . import subset
 from .visualizer import visualize_dfa
 
-def parse_nfa_description(description):
+try:
+    # In-process C++ converter built with `python setup.py build_ext --inplace`
+    import nfa2dfa_ext
+except ImportError:
+    nfa2dfa_ext = None
+
+# Matches one "Enter <field>: <value>" record per line
+_FIELD_RE = re.compile(r'^[ \t]*Enter ([^:\n]+):[ \t]*(.*)$', re.MULTILINE)
+_REQUIRED_FIELDS = ("states", "symbols", "start state", "accepting states")
+_COUNT_FIELDS = {
+    "number of states": 'states',
+    "number of symbols": 'symbols',
+    "number of accepting states": 'accepting_states',
+    "number of transitions": 'transitions'
+}
+
+# Epsilon spellings used by vision models, mapped to the converter's marker
+_EPSILON_SYMBOLS = {"ε": "#", "ϵ": "#"}
+
+def _parse_symbol(symbol):
     """
-    Convert user-friendly format to C++ program input format.
+    Normalize one input symbol to the single ASCII character the converter uses.
+    
+    Args:
+        symbol (str): Symbol as written in the description
+        
+    Returns:
+        str: The symbol, with epsilon mapped to '#'
+        
+    Raises:
+        ValueError: If the symbol is not a single ASCII character
+    """
+    symbol = _EPSILON_SYMBOLS.get(symbol, symbol)
+    if len(symbol) != 1 or not symbol.isascii():
+        raise ValueError(f"Invalid symbol '{symbol}': symbols must be single ASCII characters")
+    return symbol
+
+def parse_nfa(description):
+    """
+    Parse the user-friendly NFA description into its components.
     
     Args:
         description (str): NFA description in user-friendly format
         
     Returns:
-        str: Formatted input for the C++ program
+        dict: Mapping with 'states', 'symbols', 'start_state' and
+              'accepting_states' (lists of str, start state is a str) and
+              'transitions' (list of (fromState, symbol, toState) tuples).
+              Symbols are single ASCII characters, with epsilon as '#'.
         
     Raises:
-        ValueError: If parsing fails
+        ValueError: If parsing fails or a declared count does not match
     """
-    lines = description.strip().split('\n')
-    data = {}
+    fields = {}
     transitions = []
     
-    # print("Parsing NFA description:")
-    # print(description)
-    
-    i = 0
     try:
-        while i < len(lines):
-            line = lines[i].strip()
-            if not line:
-                i += 1
-                continue
-                
-            if "Enter number of states:" in line:
-                num_states = lines[i].split(':')[1].strip()
-                states = lines[i + 1].split(':')[1].strip()
-                i += 2
-                
-            elif "Enter number of symbols:" in line:
-                num_symbols = lines[i].split(':')[1].strip()
-                symbols = lines[i + 1].split(':')[1].strip()
-                i += 2
-                
-            elif "Enter start state:" in line:
-                start_state = lines[i].split(':')[1].strip()
-                i += 1
-                
-            elif "Enter number of accepting states:" in line:
-                num_accepting = lines[i].split(':')[1].strip()
-                accepting_states = lines[i + 1].split(':')[1].strip()
-                i += 2
-                
-            elif "Enter number of transitions:" in line:
-                num_transitions = int(lines[i].split(':')[1].strip())
-                i += 1
-                # Collect all transitions
-                for _ in range(num_transitions):
-                    if i < len(lines) and "Enter transition" in lines[i]:
-                        trans = lines[i].split(':')[1].strip()
-                        if trans:  # Only add non-empty transitions
-                            transitions.append(trans)
-                    i += 1
+        for key, value in _FIELD_RE.findall(description):
+            # Drop hints such as "(separate by space)" from the field name
+            name = key.split('(')[0].strip()
+            # Also accept numbered or plural forms such as "transition 1"
+            if name.startswith("transition"):
+                trans = value.split()
+                if trans:  # Only add non-empty transitions
+                    if len(trans) != 3:
+                        raise ValueError(f"Malformed transition: {value.strip()}")
+                    transitions.append((trans[0], _parse_symbol(trans[1]), trans[2]))
             else:
-                i += 1
-    
-        # Create the compact format
-        cpp_input = [
-            num_states,
-            states,
-            num_symbols,
-            symbols,
-            start_state,
-            num_accepting,
-            accepting_states,
-            str(len(transitions))
-        ]
-        cpp_input.extend(transitions)
+                fields[name] = value.strip()
+        
+        missing = [name for name in _REQUIRED_FIELDS if name not in fields]
+        if missing:
+            raise ValueError(f"Missing fields: {', '.join(missing)}")
+        
+        nfa = {
+            'states': fields['states'].split(),
+            'symbols': [_parse_symbol(symbol) for symbol in fields['symbols'].split()],
+            'start_state': fields['start state'],
+            'accepting_states': fields['accepting states'].split(),
+            'transitions': transitions
+        }
         
-        result = "\n".join(cpp_input)
-        # print("\nParsed C++ input:")
-        # print(result)
-        return result
+        # Declared counts are optional, but must match what was parsed
+        for count_field, key in _COUNT_FIELDS.items():
+            if count_field in fields:
+                declared = int(fields[count_field])
+                if declared != len(nfa[key]):
+                    raise ValueError(
+                        f"Declared {count_field} is {declared} but {len(nfa[key])} were found"
+                    )
+        
+        return nfa
         
     except Exception as e:
         raise ValueError(f"Error preparing NFA data: {str(e)}")
 
 def convert_to_dfa(nfa_description):
     """
-    Converts NFA to DFA using the C++ program.
+    Converts NFA to DFA using the subset construction algorithm.
+    
+    The nfa2dfa_ext extension is used when it has been built; otherwise the
+    pure-Python implementation in subset.py produces the same result.
     
     Args:
         nfa_description (str): Description of the NFA
         
     Returns:
         tuple: (conversion_output, png_data) where conversion_output is the text output
-               from the C++ program and png_data is the visualization of the DFA
+               of the conversion and png_data is the visualization of the DFA
                
     Raises:
         Exception: If conversion fails
     """
     try:
-        # Parse the user-friendly format to C++ input format
-        cpp_input = parse_nfa_description(nfa_description)
-        
-        # Get the absolute path to the cpp file
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        cpp_file = os.path.join(current_dir, "..", "cpp", "converter.cpp")
-        
-        with tempfile.NamedTemporaryFile(suffix='.exe', delete=False) as temp_exe:
-            exe_path = temp_exe.name
-            
-        try:
-            # Compile the C++ program to temporary executable
-            compile_command = f"g++ {cpp_file} -o {exe_path} -std=c++17"
-            subprocess.run(compile_command, shell=True, check=True, capture_output=True)
-            
-            # Run the converter with parsed input
-            result = subprocess.run(
-                [exe_path],
-                input=cpp_input,
-                text=True,
-                capture_output=True,
-                check=True
-            )
-            
-            # Generate visualization if dot file exists
-            if os.path.exists('dfa.dot'):
-                png_data = visualize_dfa()
-            else:
-                png_data = None
-            
-            return result.stdout, png_data
-            
-        finally:
-            # Clean up temporary executable
-            if os.path.exists(exe_path):
-                os.unlink(exe_path)
+        nfa = parse_nfa(nfa_description)
+        backend = nfa2dfa_ext if nfa2dfa_ext is not None else subset
+        log, dot = backend.convert(
+            nfa['states'],
+            nfa['symbols'],
+            nfa['start_state'],
+            nfa['accepting_states'],
+            nfa['transitions']
+        )
+        return log, visualize_dfa(dot)
         
-    except subprocess.CalledProcessError as e:
-        raise Exception(f"Program execution failed: {str(e)}\nStderr: {e.stderr}")
-    except FileNotFoundError as e:
-        raise Exception(f"File error: {str(e)}")
     except ValueError as e:
         raise Exception(f"Input parsing failed: {str(e)}")
     except Exception as e:
-        raise Exception(f"Conversion error: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Conversion error: {str(e)}")
@@ -0,0 +1,182 @@
+"""
+Pure-Python NFA to DFA conversion module.
+
+This module implements the same subset construction as src/cpp/converter.cpp
+and produces an identical conversion log and DOT description. Sets of NFA
+states are represented as integer bitmasks, so no compiler or subprocess
+is needed.
+"""
+
+from collections import deque
+
+_SEPARATOR = "*" * 44
+
+def _iter_bits(mask):
+    """
+    Yield the indices of the set bits of a mask in ascending order.
+
+    Args:
+        mask (int): Bitmask of state indices
+
+    Yields:
+        int: Index of each set bit
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def _to_symbol(symbol):
+    """
+    Validate that a symbol is a single ASCII character, as nfa2dfa_ext does.
+
+    Args:
+        symbol (str): Input symbol
+
+    Returns:
+        str: The symbol
+
+    Raises:
+        ValueError: If the symbol is not a single ASCII character
+    """
+    if len(symbol) != 1 or not symbol.isascii():
+        raise ValueError(f"Invalid symbol '{symbol}': symbols must be single ASCII characters")
+    return symbol
+
+def subset_construct(trans, start_mask):
+    """
+    Run the subset construction over bitmask encoded transitions.
+
+    Like the C++ implementation, the start state is used without epsilon
+    closure and empty target sets are not added to the DFA. Every reached
+    state is a key, including states without outgoing transitions.
+
+    Args:
+        trans (list): One list per symbol mapping a state index to the
+                      bitmask of states reachable on that symbol
+        start_mask (int): Bitmask of the start state
+
+    Returns:
+        dict: Maps each reached DFA state mask to a dict of {symbol index: target mask}
+    """
+    dfa = {}
+    seen = {start_mask}
+    worklist = deque([start_mask])
+
+    while worklist:
+        current = worklist.popleft()
+        dfa[current] = {}
+        for symbol, row in enumerate(trans):
+            next_mask = 0
+            for state in _iter_bits(current):
+                next_mask |= row[state]
+
+            if next_mask:
+                dfa[current][symbol] = next_mask
+                if next_mask not in seen:
+                    seen.add(next_mask)
+                    worklist.append(next_mask)
+
+    return dfa
+
+def convert(states, symbols, start, accepting, transitions):
+    """
+    Convert an NFA to a DFA.
+
+    Mirrors nfa2dfa_ext.convert: symbols must be single ASCII characters,
+    and the output matches the C++ implementation.
+
+    Args:
+        states (list): All states of the NFA
+        symbols (list): Input symbols
+        start (str): The start state
+        accepting (list): The accepting states
+        transitions (list): Transitions as (fromState, symbol, toState) tuples
+
+    Returns:
+        tuple: (conversion_log, dot_content)
+
+    Raises:
+        ValueError: If a symbol is not a single ASCII character
+    """
+    transitions = [(src, _to_symbol(sym), dst) for src, sym, dst in transitions]
+    symbol_list = sorted({_to_symbol(sym) for sym in symbols})
+
+    # Bit i of a mask stands for the i-th state name in sorted order, so
+    # walking the bits of a mask yields its states already sorted
+    names = sorted(set(states) | {start} | {s for t in transitions for s in (t[0], t[2])})
+    index = {name: i for i, name in enumerate(names)}
+    symbol_index = {sym: i for i, sym in enumerate(symbol_list)}
+
+    nfa_trans = {}
+    trans = [[0] * len(names) for _ in symbol_list]
+    for src, sym, dst in transitions:
+        nfa_trans.setdefault(src, {}).setdefault(sym, set()).add(dst)
+        if sym in symbol_index:
+            trans[symbol_index[sym]][index[src]] |= 1 << index[dst]
+
+    accept_mask = 0
+    for state in accepting:
+        if state in index:
+            accept_mask |= 1 << index[state]
+
+    dfa = subset_construct(trans, 1 << index[start])
+
+    def members(mask):
+        return [names[i] for i in _iter_bits(mask)]
+
+    # NFA details, as printed by NFA::displayNFA
+    log = [
+        _SEPARATOR,
+        "States: " + "".join(f"{s} " for s in sorted(set(states))),
+        "",
+        "Symbols: " + "".join(f"{s} " for s in symbol_list),
+        "",
+        f"start state: {start} ",
+        "",
+        "Transition:"
+    ]
+    for src in sorted(nfa_trans):
+        for sym in sorted(nfa_trans[src]):
+            targets = "".join(f"{s} " for s in sorted(nfa_trans[src][sym]))
+            log.append(f"From state {src} -> {sym} -> {targets}")
+    log.append("")
+    log.append("acceptance state: " + "".join(f"{s} " for s in sorted(set(accepting))))
+    log.append(_SEPARATOR)
+    log.append("")
+    log.append("Converted DFA:")
+
+    # DFA states are named in the order of their sorted member lists,
+    # matching the ordering of std::map<std::set<std::string>, ...>
+    ordered = sorted(dfa, key=members)
+    state_names = {mask: f"q{i}" for i, mask in enumerate(ordered)}
+
+    dot = ["digraph DFA {", "    rankdir=LR;"]
+    for mask in ordered:
+        label = "{" + "".join(f"{s} " for s in members(mask)) + "}"
+        shape = "doublecircle" if mask & accept_mask else "circle"
+        dot.append(f'    {state_names[mask]} [label="{label}", shape={shape}];')
+
+    dot.append("    start [shape=point];")
+    start_mask = 1 << index[start]
+    if start_mask in state_names:
+        dot.append(f"    start -> {state_names[start_mask]};")
+
+    added = set()
+    for mask in ordered:
+        from_name = state_names[mask]
+        for symbol, target in dfa[mask].items():
+            to_name = state_names[target]
+            key = from_name + symbol_list[symbol] + to_name
+            if key not in added:
+                added.add(key)
+                dot.append(f'    {from_name} -> {to_name} [label="{symbol_list[symbol]}"];')
+    dot.append("}")
+
+    for mask in ordered:
+        log.append(f"State {state_names[mask]} {{ " + "".join(f"{s} " for s in members(mask)) + "}:")
+        for symbol, target in dfa[mask].items():
+            log.append(f"    On symbol '{symbol_list[symbol]}' -> {{ "
+                       + "".join(f"{s} " for s in members(target)) + "}")
+
+    return "\n".join(log) + "\n", "\n".join(dot) + "\n"
@@ -2,18 +2,54 @@
 DFA visualization module.
 
 This module provides functionality to visualize DFA diagrams
-using Graphviz from DOT file representations.
+using Graphviz from DOT representations.
 """
 
 import graphviz
-import os
+import streamlit as st
+import threading
 
-def visualize_dfa(dot_file_path="dfa.dot"):
+try:
+    # Renders in-process through libgvc instead of spawning the dot binary
+    import pygraphviz
+except ImportError:
+    pygraphviz = None
+
+# libcgraph and libgvc are not reentrant, and Streamlit runs each session on
+# its own thread, so in-process renders must not overlap
+_GRAPHVIZ_LOCK = threading.Lock()
+
+# Distinct DFA renderings kept across reruns
+RENDER_CACHE_MAX_ENTRIES = 32
+
+@st.cache_data(show_spinner=False, max_entries=RENDER_CACHE_MAX_ENTRIES)
+def _render_png(dot_content: str) -> bytes:
+    """
+    Render DOT source to PNG, memoized on the DOT content.
+    
+    Uses pygraphviz when it is installed and falls back to the graphviz
+    package, which runs the dot executable.
+    
+    Args:
+        dot_content (str): DOT description of the graph
+        
+    Returns:
+        bytes: PNG image data
+    """
+    if pygraphviz is not None:
+        with _GRAPHVIZ_LOCK:
+            return pygraphviz.AGraph(string=dot_content).draw(format='png', prog='dot')
+    return graphviz.Source(dot_content).pipe(format='png')
+
+def visualize_dfa(dot_content):
     """
-    Converts the DOT file to PNG visualization.
+    Converts a DOT description to PNG visualization.
+    
+    Identical DOT descriptions are only rendered once; repeated conversions
+    return the cached PNG.
     
     Args:
-        dot_file_path (str): Path to the DOT file
+        dot_content (str): DOT description of the DFA
         
     Returns:
         bytes: PNG image data of the visualized DFA
@@ -22,18 +58,11 @@ def visualize_dfa(dot_file_path="dfa.dot"):
         Exception: If visualization fails
     """
     try:
-        # Read the DOT file
-        with open(dot_file_path, 'r') as f:
-            dot_content = f.read()
-        
-        # Create a Graphviz object
-        graph = graphviz.Source(dot_content)
-        
-        # Render directly to bytes
-        return graph.pipe(format='png')
+        return _render_png(dot_content)
         
     except Exception as e:
         raise Exception(f"Visualization failed: {str(e)}")
 
-# Call the function to visualize the DFA
-visualize_dfa()
+if __name__ == "__main__":
+    # Smoke test with a single accepting state
+    visualize_dfa('digraph DFA { q0 [shape=doublecircle]; }')
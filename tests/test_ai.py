@@ -0,0 +1,166 @@
+"""
+Tests for image preprocessing and AutomataAnalyzer against a mocked Mistral client.
+"""
+
+import io
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from src.python import ai
+
+class FakeJobs:
+    """Batch jobs API that reports the given statuses in turn."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.cancelled = []
+
+    def create(self, **kwargs):
+        return self._job()
+
+    def get(self, job_id):
+        return self._job()
+
+    def cancel(self, job_id):
+        self.cancelled.append(job_id)
+
+    def _job(self):
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return SimpleNamespace(id="job-1", status=status, output_file="out-1")
+
+class FakeFiles:
+    """Files API that records the uploaded batch and serves the given output records."""
+
+    def __init__(self, records):
+        self.records = records
+        self.uploaded = None
+
+    def upload(self, file, purpose):
+        self.uploaded = file["content"].decode("utf-8")
+        return SimpleNamespace(id="in-1")
+
+    def download(self, file_id):
+        content = "\n".join(json.dumps(record) for record in self.records).encode("utf-8")
+        return SimpleNamespace(read=lambda: content)
+
+def completion(custom_id, content):
+    body = {"choices": [{"message": {"content": content}}]}
+    return {"custom_id": custom_id, "response": {"status_code": 200, "body": body}, "error": None}
+
+def make_analyzer(records, statuses=("QUEUED", "RUNNING", "SUCCESS")):
+    analyzer = ai.AutomataAnalyzer(None)
+    analyzer.client = SimpleNamespace(
+        files=FakeFiles(records),
+        batch=SimpleNamespace(jobs=FakeJobs(statuses))
+    )
+    return analyzer
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    # Only skip the batch polling delay, the concurrency tests still sleep
+    monkeypatch.setattr(ai, "time", SimpleNamespace(sleep=lambda seconds: None, monotonic=time.monotonic))
+
+def test_analyze_batch_returns_results_in_input_order():
+    analyzer = make_analyzer([completion("1", "```second```"), completion("0", "first")])
+
+    assert analyzer.analyze_batch(["img0", "img1"]) == ["first", "second"]
+    uploaded = [json.loads(line) for line in analyzer.client.files.uploaded.splitlines()]
+    assert [request["custom_id"] for request in uploaded] == ["0", "1"]
+
+def test_analyze_batch_raises_on_failed_request():
+    failed = {"custom_id": "1", "response": None, "error": {"message": "rate limited"}}
+    analyzer = make_analyzer([completion("0", "first"), failed])
+
+    with pytest.raises(ValueError, match="image 1 failed: .*rate limited"):
+        analyzer.analyze_batch(["img0", "img1"])
+
+def test_analyze_batch_raises_on_missing_result():
+    analyzer = make_analyzer([completion("0", "first")])
+
+    with pytest.raises(ValueError, match="no result for images 1"):
+        analyzer.analyze_batch(["img0", "img1"])
+
+def test_analyze_batch_raises_on_failed_job():
+    analyzer = make_analyzer([], statuses=("RUNNING", "FAILED"))
+
+    with pytest.raises(ValueError, match="ended with status FAILED"):
+        analyzer.analyze_batch(["img0"])
+
+def test_analyze_batch_cancels_job_after_timeout():
+    analyzer = make_analyzer([], statuses=("RUNNING",))
+
+    with pytest.raises(ValueError, match="did not finish within 0 seconds"):
+        analyzer.analyze_batch(["img0"], timeout=0)
+    assert analyzer.client.batch.jobs.cancelled == ["job-1"]
+
+def image_bytes(size, image_format, color="white"):
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, image_format, optimize=True)
+    return buf.getvalue()
+
+def test_preprocess_image_keeps_small_original():
+    original = image_bytes((64, 64), "PNG")
+
+    assert ai.preprocess_image(original) == original
+
+def test_preprocess_image_downscales_large_image():
+    processed = ai.preprocess_image(image_bytes((4000, 1000), "JPEG"))
+
+    assert Image.open(io.BytesIO(processed)).size == (ai.MAX_IMAGE_EDGE, ai.MAX_IMAGE_EDGE // 4)
+
+@pytest.mark.parametrize("image_format, mime_type", [("PNG", "image/png"), ("JPEG", "image/jpeg")])
+def test_build_messages_uses_image_mime_type(image_format, mime_type):
+    image_data = ai.encode_image_cached(image_bytes((8, 8), image_format))
+    messages = ai.AutomataAnalyzer(None)._build_messages(image_data)
+
+    assert messages[1]["content"][1]["image_url"]["url"].startswith(f"data:{mime_type};base64,")
+
+def make_concurrent_analyzer(monkeypatch, encode, analyze=lambda image_data: f"result {image_data}"):
+    analyzer = ai.AutomataAnalyzer(None)
+    monkeypatch.setattr(analyzer, "encode_image", encode)
+    monkeypatch.setattr(analyzer, "analyze", analyze)
+    return analyzer
+
+def test_analyze_many_returns_results_in_input_order(monkeypatch):
+    def encode(uploaded_file):
+        # Finish the earlier files last
+        time.sleep(0.01 * (5 - uploaded_file))
+        return uploaded_file
+
+    analyzer = make_concurrent_analyzer(monkeypatch, encode)
+
+    assert analyzer.analyze_many(list(range(6))) == [f"result {i}" for i in range(6)]
+
+def test_analyze_many_propagates_analysis_errors(monkeypatch):
+    def analyze(image_data):
+        if image_data == 2:
+            raise RuntimeError("service unavailable")
+        return image_data
+
+    analyzer = make_concurrent_analyzer(monkeypatch, lambda uploaded_file: uploaded_file, analyze)
+
+    with pytest.raises(RuntimeError, match="service unavailable"):
+        analyzer.analyze_many(list(range(4)))
+
+def test_analyze_many_cancels_queued_images_after_failure(monkeypatch):
+    encoded = []
+    analyzed = []
+
+    def encode(uploaded_file):
+        encoded.append(uploaded_file)
+        if uploaded_file == 0:
+            raise ValueError("Image encoding failed: broken")
+        time.sleep(0.02)
+        return uploaded_file
+
+    monkeypatch.setattr(ai, "MAX_WORKERS", 1)
+    analyzer = make_concurrent_analyzer(monkeypatch, encode, analyzed.append)
+
+    with pytest.raises(ValueError, match="broken"):
+        analyzer.analyze_many(list(range(8)))
+    assert len(encoded) < 8
+    assert analyzed == []
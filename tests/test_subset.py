@@ -0,0 +1,165 @@
+"""
+Tests for the pure-Python NFA to DFA conversion and the NFA description parser.
+"""
+
+import random
+
+import pytest
+
+from src.python import subset
+from src.python.converter import parse_nfa
+
+EXAMPLE_NFA = (
+    ["q0", "q1", "q2"],
+    ["a", "b"],
+    "q0",
+    ["q2"],
+    [("q0", "a", "q0"), ("q0", "a", "q1"), ("q1", "b", "q2"), ("q0", "b", "q0")],
+)
+
+EXAMPLE_LOG = """\
+********************************************
+States: q0 q1 q2 
+
+Symbols: a b 
+
+start state: q0 
+
+Transition:
+From state q0 -> a -> q0 q1 
+From state q0 -> b -> q0 
+From state q1 -> b -> q2 
+
+acceptance state: q2 
+********************************************
+
+Converted DFA:
+State q0 { q0 }:
+    On symbol 'a' -> { q0 q1 }
+    On symbol 'b' -> { q0 }
+State q1 { q0 q1 }:
+    On symbol 'a' -> { q0 q1 }
+    On symbol 'b' -> { q0 q2 }
+State q2 { q0 q2 }:
+    On symbol 'a' -> { q0 q1 }
+    On symbol 'b' -> { q0 }
+"""
+
+EXAMPLE_DOT = """\
+digraph DFA {
+    rankdir=LR;
+    q0 [label="{q0 }", shape=circle];
+    q1 [label="{q0 q1 }", shape=circle];
+    q2 [label="{q0 q2 }", shape=doublecircle];
+    start [shape=point];
+    start -> q0;
+    q0 -> q1 [label="a"];
+    q0 -> q0 [label="b"];
+    q1 -> q1 [label="a"];
+    q1 -> q2 [label="b"];
+    q2 -> q1 [label="a"];
+    q2 -> q0 [label="b"];
+}
+"""
+
+SINK_DOT = """\
+digraph DFA {
+    rankdir=LR;
+    q0 [label="{q0 }", shape=circle];
+    q1 [label="{q1 }", shape=doublecircle];
+    start [shape=point];
+    start -> q0;
+    q0 -> q1 [label="a"];
+}
+"""
+
+EXAMPLE_DESCRIPTION = """\
+Enter number of states: 3  
+Enter states: q0 q1 q2  
+Enter number of symbols: 2  
+Enter symbols (separate by space): a b  
+Enter start state: q0  
+Enter number of accepting states: 1  
+Enter accepting states: q2  
+Enter number of transitions: 4  
+Enter transition (fromState symbol toState): q0 a q0  
+Enter transition (fromState symbol toState): q0 a q1  
+Enter transition (fromState symbol toState): q1 b q2  
+Enter transition (fromState symbol toState): q0 b q0  
+"""
+
+def random_nfa(seed):
+    """Build a small random NFA, including transitions on undeclared symbols and states."""
+    rng = random.Random(seed)
+    states = [f"q{i}" for i in range(rng.randint(1, 12))]
+    symbols = rng.sample(list("ab01#c"), rng.randint(1, 4))
+    transitions = [
+        (rng.choice(states), rng.choice(symbols + ["z"]), rng.choice(states + ["x9"]))
+        for _ in range(rng.randint(0, 3 * len(states)))
+    ]
+    return states, symbols, rng.choice(states), rng.sample(states, rng.randint(0, len(states))), transitions
+
+def test_convert_matches_golden_output():
+    assert subset.convert(*EXAMPLE_NFA) == (EXAMPLE_LOG, EXAMPLE_DOT)
+
+def test_convert_names_states_without_outgoing_transitions():
+    log, dot = subset.convert(["q0", "q1"], ["a"], "q0", ["q1"], [("q0", "a", "q1")])
+    assert dot == SINK_DOT
+    assert log.endswith("State q1 { q1 }:\n")
+
+@pytest.mark.parametrize("symbol", ["ε", "ab", ""])
+def test_convert_rejects_invalid_symbols(symbol):
+    with pytest.raises(ValueError, match="single ASCII"):
+        subset.convert(["q0"], [symbol], "q0", [], [])
+    with pytest.raises(ValueError, match="single ASCII"):
+        subset.convert(["q0"], ["a"], "q0", [], [("q0", symbol, "q0")])
+
+def test_convert_matches_extension():
+    nfa2dfa_ext = pytest.importorskip("nfa2dfa_ext")
+    for seed in range(500):
+        nfa = random_nfa(seed)
+        assert subset.convert(*nfa) == nfa2dfa_ext.convert(*nfa)
+
+def test_parse_nfa():
+    assert parse_nfa(EXAMPLE_DESCRIPTION) == {
+        'states': ["q0", "q1", "q2"],
+        'symbols': ["a", "b"],
+        'start_state': "q0",
+        'accepting_states': ["q2"],
+        'transitions': EXAMPLE_NFA[4],
+    }
+
+def test_parse_nfa_maps_epsilon_to_marker():
+    description = EXAMPLE_DESCRIPTION.replace("a b", "ε b").replace("q0 a q1", "q0 ε q1")
+    nfa = parse_nfa(description)
+    assert nfa['symbols'] == ["#", "b"]
+    assert ("q0", "#", "q1") in nfa['transitions']
+
+def test_parse_nfa_missing_fields():
+    description = "Enter states: q0 q1\nEnter symbols (separate by space): a\n"
+    with pytest.raises(ValueError, match="Missing fields: start state, accepting states"):
+        parse_nfa(description)
+
+def test_parse_nfa_malformed_transition():
+    description = EXAMPLE_DESCRIPTION.replace("q1 b q2", "q1 b")
+    with pytest.raises(ValueError, match="Malformed transition: q1 b"):
+        parse_nfa(description)
+
+@pytest.mark.parametrize("label", ["transition 1", "transitions (fromState symbol toState)"])
+def test_parse_nfa_numbered_and_plural_transitions(label):
+    description = EXAMPLE_DESCRIPTION.replace("transition (fromState symbol toState)", label)
+    assert parse_nfa(description)['transitions'] == EXAMPLE_NFA[4]
+
+def test_parse_nfa_transition_count_mismatch():
+    description = EXAMPLE_DESCRIPTION.replace("number of transitions: 4", "number of transitions: 5")
+    with pytest.raises(ValueError, match="Declared number of transitions is 5 but 4 were found"):
+        parse_nfa(description)
+
+def test_parse_nfa_state_count_mismatch():
+    description = EXAMPLE_DESCRIPTION.replace("number of states: 3", "number of states: 2")
+    with pytest.raises(ValueError, match="Declared number of states is 2 but 3 were found"):
+        parse_nfa(description)
+
+def test_parse_nfa_invalid_symbol():
+    with pytest.raises(ValueError, match="Invalid symbol 'ab'"):
+        parse_nfa(EXAMPLE_DESCRIPTION.replace("a b", "ab b"))